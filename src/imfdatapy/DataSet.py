@@ -4,19 +4,27 @@ import re
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import sdmx.message
 
+_RE_MONTHLY = re.compile(r"^(\d{4})-M(\d+)$")
+_RE_QUARTERLY = re.compile(r"^(\d{4})-Q(\d+)$")
+_RE_ANNUAL = re.compile(r"^\d{4}$")
+_RE_NON_ALNUM = re.compile(r"[^A-Za-z0-9]+", re.ASCII)
+
 @dataclass
 class DimensionEnv:
     """Simple dot-accessible container for code lists."""
     _attrs: Dict[str, str] = field(default_factory=dict)
 
-    def __getattr__(self, item: str) -> str:
-        try:
-            return self._attrs[item]
-        except KeyError as e:
-            raise AttributeError(item) from e
+    def __post_init__(self) -> None:
+        # Store codes as real instance attributes so env.USA is a plain attribute
+        # lookup instead of a __getattr__ call after a failed one.
+        for k in self._attrs:
+            if k.startswith("_"):
+                raise ValueError(f"Invalid DimensionEnv key: {k!r}")
+        self.__dict__.update(self._attrs)
 
     def __dir__(self) -> List[str]:
         return sorted(list(self._attrs.keys()))
@@ -29,7 +37,10 @@ def sanitize(name: str) -> str:
     """Convert any string into a valid Python identifier."""
     if not isinstance(name, str):
         name = str(name)
-    name = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_")
+    if name.isascii() and name.isalnum():
+        # Fast path: plain labels such as 'USA' need no substitution
+        return name if name[0].isalpha() else f"X{name}"
+    name = _RE_NON_ALNUM.sub("_", name).strip("_")
     if not name or not name[0].isalpha():
         name = f"X{name}"
     return name
@@ -48,7 +59,31 @@ def make_env(pairs: Iterable[tuple[str, str]], *, keep: str = "first") -> Dimens
             d[k] = code
     return DimensionEnv(d)
 
-def convert_time_period_auto(df, time_col: str = "TIME_PERIOD", out_col: str = "date"):
+# Resolution pd.to_datetime uses by default (ns before pandas 3, us from pandas 3), and the
+# range of whole days it can hold
+_DATETIME_DTYPE = pd.to_datetime(["2000-01-01"]).dtype
+_DATETIME_MAX_DAYS = np.iinfo(np.int64).max // int(np.timedelta64(1, "D") / np.timedelta64(1, np.datetime_data(_DATETIME_DTYPE)[0]))
+
+_PERIOD_PATTERNS = {"M": _RE_MONTHLY, "Q": _RE_QUARTERLY, "A": _RE_ANNUAL}
+_FREQ_ALIASES = {"M": "M", "Q": "Q", "A": "A", "Y": "A"}
+
+def _period_fields(s: pd.Series, freq: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse period strings of a single frequency into float (year, end month) arrays.
+    Values that do not match are NaN.
+    """
+    if freq == "M":
+        fields = s.str.extract(_RE_MONTHLY).astype(float)
+        fields = fields.where(fields[1].between(1, 12))
+        return fields[0].to_numpy(), fields[1].to_numpy()
+    if freq == "Q":
+        fields = s.str.extract(_RE_QUARTERLY).astype(float)
+        fields = fields.where(fields[1].between(1, 4))
+        return fields[0].to_numpy(), (fields[1] * 3).to_numpy()
+    year = s.where(s.str.fullmatch(_RE_ANNUAL)).astype(float).to_numpy()
+    return year, np.where(np.isnan(year), np.nan, 12.0)
+
+def convert_time_period_auto(df, time_col: str = "TIME_PERIOD", out_col: str = "date", freq: Optional[str] = None, copy: bool = False):
     """
     Convert a 'TIME_PERIOD' column to Python date objects at the END of the period.
     Supported formats (auto-detected):
@@ -56,45 +91,50 @@ def convert_time_period_auto(df, time_col: str = "TIME_PERIOD", out_col: str = "
       - Monthly:   '1960-M04'      -> 1960-04-30
       - Quarterly: '1960-Q2'       -> 1960-06-30
     Unrecognized formats are left as NaT.
+    Pass freq ('A'/'Y', 'Q' or 'M') when all periods share one frequency to skip
+    auto-detection; values in any other format then become NaT.
+    The column is added to df in place (and df returned); pass copy=True to leave df untouched.
     """
-    s = df[time_col].astype(str)
-    result = []
+    # Periods repeat once per series, so parse each distinct value once and gather back
+    codes, uniques = pd.factorize(df[time_col], use_na_sentinel=False)
+    s = pd.Series(uniques).astype(str).str.strip()
 
-    for val in s:
-        val = val.strip()
+    if freq is not None:
         try:
-            if "-M" in val:
-                year_str, month_part = val.split("-M")
-                if year_str.isdigit() and month_part.isdigit():
-                    year = int(year_str)
-                    month = int(month_part)
-                    if 1 <= month <= 12:
-                        dt = pd.Timestamp(year=year, month=month, day=1) + pd.offsets.MonthEnd(1)
-                        result.append(dt)
-                        continue
-            elif "-Q" in val:
-                year_str, q_part = val.split("-Q")
-                if year_str.isdigit() and q_part.isdigit():
-                    year = int(year_str)
-                    quarter = int(q_part)
-                    if 1 <= quarter <= 4:
-                        month = quarter * 3
-                        dt = pd.Timestamp(year=year, month=month, day=1) + pd.offsets.MonthEnd(1)
-                        result.append(dt)
-                        continue
-            elif val.isdigit() and len(val) == 4:
-                year = int(val)
-                result.append(pd.Timestamp(year=year, month=12, day=31))
-                continue
-        except Exception:
-            pass
-
-    # If no match or error, append NaT
-        result.append(pd.NaT)
-
-    df_copy = df.copy()
-    df_copy[out_col] = pd.to_datetime(result)
-    return df_copy
+            order = [_FREQ_ALIASES[freq.upper()]]
+        except KeyError:
+            raise ValueError(f"Unsupported freq '{freq}', expected one of 'A', 'Y', 'Q', 'M'.")
+    else:
+        # Queries almost always return a single frequency: try the one the first values use first
+        probe = s.iloc[:32]
+        order = sorted(_PERIOD_PATTERNS, key=lambda f: not probe.str.fullmatch(_PERIOD_PATTERNS[f]).all())
+
+    year = month = None
+    for f in order:
+        f_year, f_month = _period_fields(s, f)
+        if year is None:
+            year, month = f_year, f_month
+        else:
+            missing = np.isnan(year)
+            year = np.where(missing, f_year, year)
+            month = np.where(missing, f_month, month)
+        if not np.isnan(year).any():
+            break
+
+    # End of period = first day of the following month minus one day, in day-resolution
+    # datetime64 arithmetic, then cast to pandas' default resolution. Dates that resolution
+    # cannot hold (outside 1677-2262 for ns) become NaT rather than overflowing.
+    ends = np.full(len(year), np.datetime64("NaT"), dtype="datetime64[D]")
+    valid = ~np.isnan(year)
+    next_month = ((year[valid] - 1970) * 12 + month[valid]).astype("i8")
+    ends[valid] = next_month.astype("datetime64[M]") - np.timedelta64(1, "D")
+    days = ends.astype("i8")
+    ends[(days < 1 - _DATETIME_MAX_DAYS) | (days > _DATETIME_MAX_DAYS)] = np.datetime64("NaT")
+
+    if copy:
+        df = df.copy()
+    df[out_col] = ends.astype(_DATETIME_DTYPE)[codes]
+    return df
 
 class DataSet:
 
@@ -127,7 +167,10 @@ class DataSet:
         - dimension: the dimension ID
         - codelists: the codelist ID if available, else None
         """
-        return pd.DataFrame([(y,x) for (x,y) in self._dimensions()], columns=["dimension", "codelists"])
+        dims = self._dimensions()
+        return pd.DataFrame({"dimension": [dim_id for _, dim_id in dims],
+                             "codelists": [cl_id for cl_id, _ in dims]},
+                            columns=["dimension", "codelists"])
     
     def get_dimensions_env(self):
         """
@@ -137,52 +180,61 @@ class DataSet:
     
     #@cached_property
     def codelists_summary(self) -> pd.DataFrame:
-        rows = [
-            {
-                    "codelist_id": cl.id,
-                    "name": cl.name,
-                    "version": cl.version,
-                    "n_codes": len(cl),
-            }
-            for cl in self.msg.codelist.values()
-        ]
-        return pd.DataFrame(rows, columns=["codelist_id", "name", "version", "n_codes"])
+        codelists = list(self.msg.codelist.values())
+        return pd.DataFrame({"codelist_id": [cl.id for cl in codelists],
+                             "name": [str(cl.name) if cl.name is not None else None for cl in codelists],
+                             "version": [cl.version for cl in codelists],
+                             "n_codes": [len(cl) for cl in codelists]},
+                            columns=["codelist_id", "name", "version", "n_codes"])
     
-    #@lru_cache(maxsize=10)
-    def _get_codelist(self, codelist_id: str) -> list[Dict[str, Optional[str]]]:
-        """
-        Return the codes for a single codelist as DataFrame with columns:
-        code_id, name, description
-        """
+    def _lookup_codelist(self, codelist_id: str):
         try:
-            cl = self.msg.codelist[codelist_id]
+            return self.msg.codelist[codelist_id]
         except KeyError:
             raise ValueError(f"Codelist '{codelist_id}' not found.")
-        rows = []
-        for code in cl.items.values():
-            rows.append(
-                (
-                    code.id,
-                    code.name,
-                    code.description,
-                )
+
+    #@lru_cache(maxsize=10)
+    def _get_codelist(self, codelist_id: str) -> list[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Return the codes for a single codelist as (code_id, name, description) tuples
+        """
+        cl = self._lookup_codelist(codelist_id)
+        return [
+            (
+                code.id,
+                str(code.name) if code.name is not None else None,
+                str(code.description) if code.description is not None else None,
             )
-        return rows
+            for code in cl.items.values()
+        ]
+
+    def _codelist_pairs(self, codelist_id: str) -> Iterable[Tuple[str, Optional[str]]]:
+        """
+        (code_id, name) pairs for make_env, without materialising descriptions
+        """
+        cl = self._lookup_codelist(codelist_id)
+        return ((code.id, code.name) for code in cl.items.values())
     
     def get_codelist(self, codelist_id: str) -> pd.DataFrame:
         """
         Return the codes for a single codelist as DataFrame with columns:
         code_id, name, description
         """
-        return pd.DataFrame(self._get_codelist(codelist_id), columns=["code_id", "name", "description"])
+        codes = self._get_codelist(codelist_id)
+        return pd.DataFrame({"code_id": [c[0] for c in codes],
+                             "name": [c[1] for c in codes],
+                             "description": [c[2] for c in codes]},
+                            columns=["code_id", "name", "description"])
 
     def get_codelist_env(self, codelist_id: str) -> pd.DataFrame:
-        return make_env(self._get_codelist(codelist_id))
+        return make_env(self._codelist_pairs(codelist_id))
 
-    def get_data(self, key: str, params: Optional[dict] = None, *, convert_dates: bool = True) -> pd.DataFrame:
+    def get_data(self, key: str, params: Optional[dict] = None, *, convert_dates: bool = True, categorical: bool = False, freq: Optional[str] = None) -> pd.DataFrame:
         return self.connection.get_data(datasetID=self.datasetID, 
                                         agency=self.agencyID,
                                         version=self.version, 
                                         key=key,
                                         params=params, 
-                                        convert_dates=convert_dates)
+                                        convert_dates=convert_dates,
+                                        categorical=categorical,
+                                        freq=freq)
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Optional
 
 import logging
+import time
 import pandas as pd
 import sdmx
 from sdmx.source.imf_data import Source as IMFDataSource
@@ -15,6 +16,17 @@ from .DataSet import DataSet, convert_time_period_auto
 # Cache classes so repeated calls for the same workspace reuse the same class object
 _SOURCE_CLASS_CACHE: dict[str, type] = {}
 
+# Metadata listings (dataflows, codelists, ...) are effectively static within a session.
+# Keyed by (source id, authentication, internalUser, resource, args, kwargs) -> (expires_at, DataFrame)
+_METADATA_CACHE: dict[tuple, tuple[float, pd.DataFrame]] = {}
+METADATA_CACHE_TTL = 3600
+
+def invalidate_metadata_cache() -> None:
+    """
+    Drop all cached metadata listings so the next call fetches them again.
+    """
+    _METADATA_CACHE.clear()
+
 class IgnoreStructureWarning(logging.Filter):
     def filter(self, record):
         # Return False to hide the record if it contains this specific text
@@ -58,22 +70,34 @@ class _IMFDataStudioClientFactory:
 
 class IMFData:
 
-    __slots__ = ["_client", "_token_provider", "portalEnvironment", "workspace"]
+    __slots__ = ["_sdmx_client", "_token_provider", "portalEnvironment", "workspace", "_dsd_cache", "_codelist_cache"]
 
     def __init__(self, authentication: bool = False, internalUser: bool = True, portalEnvironment: bool = True, workspace:str = None):
-        if portalEnvironment:
-            self._client = sdmx.Client("IMF_DATA")
-        else:
+        if not portalEnvironment:
             if not internalUser:
                 raise PermissionError("External Users do not have access to Studio enviroment.")
             if not authentication:
                 raise PermissionError("Studio enviroment requires authentication.")
-            self._client = _IMFDataStudioClientFactory(workspace)
-            self._client.session.headers["Ocp-Apim-Subscription-Key"] = "3402883102db42a0b0b75923317cfc22"
-        self._client.session.headers["User-Agent"] = 'imfidata-client'
+        self._sdmx_client = None
         self._token_provider = TokenProvider(internalUser=internalUser, enabled=authentication)
         self.portalEnvironment = portalEnvironment
         self.workspace = workspace
+        # (id, agency, version, authentication) -> StructureMessage / Codelist
+        self._dsd_cache: dict[tuple, sdmx.message.StructureMessage] = {}
+        self._codelist_cache: dict[tuple, sdmx.model.common.Codelist] = {}
+
+    @property
+    def _client(self) -> sdmx.Client:
+        # Built on first use, so creating an IMFData sets up no session until a request is made
+        if self._sdmx_client is None:
+            if self.portalEnvironment:
+                client = sdmx.Client("IMF_DATA")
+            else:
+                client = _IMFDataStudioClientFactory(self.workspace)
+                client.session.headers["Ocp-Apim-Subscription-Key"] = "3402883102db42a0b0b75923317cfc22"
+            client.session.headers["User-Agent"] = 'imfidata-client'
+            self._sdmx_client = client
+        return self._sdmx_client
 
     def __str__(self) -> str:
         env_str = "data.imf.org" if self.portalEnvironment else "datastudio.imf.org"
@@ -117,6 +141,15 @@ class IMFData:
         self._token_provider.disable()
         self._sync_headers()
 
+    def clear_cache(self):
+        '''
+        Forget dataset structures and codelists fetched by this connection, and
+        the module-wide metadata listings (see invalidate_metadata_cache()).
+        '''
+        self._dsd_cache.clear()
+        self._codelist_cache.clear()
+        invalidate_metadata_cache()
+
     def _call(self, method, *args, **kwargs):
         self._sync_headers()
         return method(*args, **kwargs)
@@ -128,14 +161,21 @@ class IMFData:
 
     @staticmethod
     def _list_to_pandas(container):
-        rows = []
-        for artefact in container.values():
-            rows.append({"id":artefact.id, 
-                         "version":artefact.version, 
-                         "agencyID": getattr(artefact.maintainer, "id", artefact.maintainer),
-                         "name_en": str(artefact.name) if artefact.name is not None else None
-                         })
-        return pd.DataFrame(rows, columns=["id", "version", "agencyID", "name_en"]) 
+        artefacts = list(container.values())
+        return pd.DataFrame({"id": [a.id for a in artefacts],
+                             "version": [a.version for a in artefacts],
+                             "agencyID": [getattr(a.maintainer, "id", a.maintainer) for a in artefacts],
+                             "name_en": [str(a.name) if a.name is not None else None for a in artefacts],
+                             }, columns=["id", "version", "agencyID", "name_en"])
+
+    def _get_list_cached(self, method, *args, attr: str, **kwargs) -> pd.DataFrame:
+        key = (self._client.source.id, self.authentication, self.internalUser, attr, args, tuple(sorted(kwargs.items())))
+        hit = _METADATA_CACHE.get(key)
+        if hit is None or time.time() >= hit[0]:
+            df = self._list_to_pandas(self._get_list(method, *args, attr=attr, **kwargs))
+            hit = _METADATA_CACHE[key] = (time.time() + METADATA_CACHE_TTL, df)
+        # callers may modify the frame, so never hand out the cached object itself
+        return hit[1].copy()
 
     def _get_first(self, method, *args, attr: str, **kwargs):
         return self._get_list(method, *args, attr=attr, **kwargs)[0]
@@ -154,35 +194,37 @@ class IMFData:
     
     def listDatasets(self, id: Optional[str] = None, agency:str = 'all', version:str = 'all') -> pd.DataFrame:
         args = [id] if id else []
-        return self._list_to_pandas(self._get_list(self._client.dataflow, *args, agency_id=agency, version=version, attr="dataflow"))
+        return self._get_list_cached(self._client.dataflow, *args, agency_id=agency, version=version, attr="dataflow")
     
     def listCodelists(self, id: Optional[str] = None, agency:str = 'all', version:str = 'all') -> pd.DataFrame:
         args = [id] if id else []
-        return self._list_to_pandas(self._get_list(self._client.codelist, *args, agency_id=agency, version=version, attr="codelist"))
+        return self._get_list_cached(self._client.codelist, *args, agency_id=agency, version=version, attr="codelist")
     
     def listConceptSchemes(self, id: Optional[str] = None, agency:str = 'all', version:str = 'all')  -> pd.DataFrame:
         args = [id] if id else []
-        return self._list_to_pandas(self._get_list(self._client.conceptscheme, *args, agency_id=agency, version=version, attr="concept_scheme"))
+        return self._get_list_cached(self._client.conceptscheme, *args, agency_id=agency, version=version, attr="concept_scheme")
     
     def listDataStructures(self, id: Optional[str] = None, agency:str = 'all', version:str = 'all') -> list[sdmx.model.common.Structure]:
         args = [id] if id else []
-        return self._list_to_pandas(self._get_list(self._client.datastructure, id, agency_id=agency, version=version, attr="structure"))
+        return self._get_list_cached(self._client.datastructure, id, agency_id=agency, version=version, attr="structure")
 
     def getDataset(self, id: str, agency:Optional[str] = None, version:Optional[str] = None) -> DataSet:
-        
-        kw = {}
-        if agency is not None:
-            kw["agency_id"] = agency
-        if version is not None:
-            kw["version"] = version
-
-        msg = self._call(self._client.dataflow, id, **kw)
+        cache_key = (id, agency, version, self.authentication)
+        msg = self._dsd_cache.get(cache_key)
+        if msg is None:
+            # One structure fetch: the DSD, concept schemes and codelists DataSet needs come along
+            kw = self._set_kwargs({"params": {"references": "descendants"}}, agency, version)
+            msg = self._dsd_cache[cache_key] = self._call(self._client.dataflow, id, **kw)
         return DataSet(msg, self)
 
 
     def getCodelist(self: dict[str], id: str, agency:Optional[str] = None, version:Optional[str] = None) -> sdmx.model.common.Codelist:
-        kwargs = self._set_kwargs({"attr": "codelist"}, agency, version)
-        return self._get_first(self._client.codelist, id, **kwargs)
+        cache_key = (id, agency, version, self.authentication)
+        codelist = self._codelist_cache.get(cache_key)
+        if codelist is None:
+            kwargs = self._set_kwargs({"attr": "codelist"}, agency, version)
+            codelist = self._codelist_cache[cache_key] = self._get_first(self._client.codelist, id, **kwargs)
+        return codelist
     
     def getConceptScheme(self, id: str, agency:Optional[str] = None, version:Optional[str] = None) -> sdmx.model.common.ConceptScheme:
         kwargs = self._set_kwargs({"attr": "concept_scheme"}, agency, version)
@@ -192,7 +234,7 @@ class IMFData:
         kwargs = self._set_kwargs({"attr": "structure"}, agency, version)
         return self._get_first(self._client.datastructure, id, **kwargs)
       
-    def get_data(self, datasetID: str, agency:Optional[str] = None, version:Optional[str] = None, key: str = 'all',params: Optional[dict] = None, *, convert_dates: bool = True,) -> pd.DataFrame:
+    def get_data(self, datasetID: str, agency:Optional[str] = None, version:Optional[str] = None, key: str = 'all',params: Optional[dict] = None, *, convert_dates: bool = True, categorical: bool = False, freq: Optional[str] = None) -> pd.DataFrame:
         params = params or {}
         flowRef = ",".join(x for x in (agency, datasetID, version) if x is not None)
 
@@ -204,8 +246,14 @@ class IMFData:
         finally:
             logger.removeFilter(filter_obj)
 
-        df = sdmx.to_pandas(msg).reset_index()
+        data = sdmx.to_pandas(msg)
+        df = data.reset_index()
+        if categorical:
+            # Dimension columns repeat the same few codes on every observation
+            for col in data.index.names:
+                if col is not None and col != "TIME_PERIOD" and col in df.columns:
+                    df[col] = df[col].astype("category")
         if convert_dates and not df.empty and "TIME_PERIOD" in df.columns:
             if len(df) > 0:
-                df = convert_time_period_auto(df, time_col="TIME_PERIOD", out_col="date")
+                df = convert_time_period_auto(df, time_col="TIME_PERIOD", out_col="date", freq=freq)
         return df
@@ -1,10 +1,13 @@
+import atexit
 from dataclasses import dataclass
 import os
 from pathlib import Path
 import shutil
 import subprocess
+import tempfile
 import time
 from typing import Optional
+import zlib
 
 from msal import PublicClientApplication, SerializableTokenCache
 
@@ -13,12 +16,63 @@ BUFFER = 60
 
 @dataclass
 class AccessToken:
+    __slots__ = ["token", "expires_at"]
+
     token: str
     expires_at: float  # epoch seconds
 
     def is_expired(self) -> bool:
         return time.time() >= (self.expires_at - BUFFER)
 
+# One MSAL app (and its token cache) per cache file, shared by every TokenProvider in the process
+_APPS: dict[str, tuple[PublicClientApplication, SerializableTokenCache]] = {}
+# Last token per user type, so new connections don't re-run SSO/MSAL while it is still valid
+_SHARED_TOKENS: dict[bool, AccessToken] = {}
+
+def _load_cache(cache_path: str) -> SerializableTokenCache:
+    cache = SerializableTokenCache()
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                raw = f.read()
+            try:
+                raw = zlib.decompress(raw)
+            except zlib.error:
+                pass  # plain JSON written by an older version
+            cache.deserialize(raw.decode("utf-8"))
+        except Exception:
+            cache = SerializableTokenCache()  # corrupted cache → reset
+    return cache
+
+def _persist_cache(cache: SerializableTokenCache, cache_path: str) -> None:
+    if cache.has_state_changed:
+        # zlib-compressed JSON, written to a private (0600) temp file unique to this process and
+        # swapped in, so readers and concurrently exiting processes never see a partial file
+        data = zlib.compress(cache.serialize().encode("utf-8"), 1)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), prefix=os.path.basename(cache_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+def _build_app(client_id: str, authority: str, cache_path: str) -> tuple[PublicClientApplication, SerializableTokenCache]:
+    cache_path = os.path.abspath(cache_path)
+    entry = _APPS.get(cache_path)
+    if entry is None:
+        cache = _load_cache(cache_path)
+        app = PublicClientApplication(
+            client_id=client_id,
+            authority=authority,
+            token_cache=cache,
+        )
+        entry = _APPS[cache_path] = (app, cache)
+        # silent refreshes are written once on exit instead of after every request
+        atexit.register(_persist_cache, cache, cache_path)
+    return entry
+
 class TokenProvider:
     """
     Provides access tokens on demand.
@@ -26,6 +80,8 @@ class TokenProvider:
     - internalUser=False: MSAL B2C
     Caches the token until near expiry.
     """
+    __slots__ = ["internalUser", "enabled", "_cached"]
+
     def __init__(self, internalUser: bool, enabled: bool = True):
         self.internalUser = internalUser
         self.enabled = enabled
@@ -52,9 +108,15 @@ class TokenProvider:
         if self._cached and not self._cached.is_expired():
             return self._cached.token
 
+        shared = _SHARED_TOKENS.get(self.internalUser)
+        if shared and not shared.is_expired():
+            self._cached = shared
+            return shared.token
+
         # Acquire a new token and store it with an expiry
         token, expires_in = self._get_token()
         self._cached = AccessToken(token=token, expires_at=time.time() + expires_in)
+        _SHARED_TOKENS[self.internalUser] = self._cached
         return token
 
     def _get_token_SSO(self, timeout: int = 90) -> str:
@@ -89,28 +151,14 @@ class TokenProvider:
     @staticmethod
     def _get_token_PY(client_id:str, scopes:list[str], authority:str, cache_path:str) -> tuple[str, int]:
 
-        cache = SerializableTokenCache()
-        if os.path.exists(cache_path):
-            try:
-                with open(cache_path, "r", encoding="utf-8") as f:
-                    cache.deserialize(f.read())
-            except Exception:
-                cache = SerializableTokenCache()  # corrupted cache → reset
-
-        app = PublicClientApplication(
-            client_id=client_id,
-            authority=authority,
-            token_cache=cache,
-        )
+        app, cache = _build_app(client_id, authority, cache_path)
 
         accounts = app.get_accounts()
         result = app.acquire_token_silent(scopes, account=accounts[0]) if accounts else None
         if not result:
             result = app.acquire_token_interactive(scopes=scopes)
-
-        if cache.has_state_changed:
-            with open(cache_path, "w", encoding="utf-8") as f:
-                f.write(cache.serialize())
+            # persist a fresh interactive login right away so a crash doesn't lose it
+            _persist_cache(cache, os.path.abspath(cache_path))
 
         token = (result or {}).get("access_token")
         if not token:
@@ -1,5 +1,5 @@
-from .IMFData import IMFData
+from .IMFData import IMFData, invalidate_metadata_cache
 from .utilities import make_key_str
 
-__all__ = ["IMFData", "make_key_str"]
+__all__ = ["IMFData", "invalidate_metadata_cache", "make_key_str"]
 __version__ = "0.2.0"
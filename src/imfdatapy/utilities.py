@@ -1,43 +1,28 @@
-def make_key_str(key) -> str:
-    parts = []
-    for group in key:
-        if group is None:
-            parts.append('')
+def _encode_group(group) -> str:
+    if group is None:
+        return ''
+    if isinstance(group, str):
+        return group  # single string
+    # Assume it's an iterable (list, tuple, R vector, etc.)
+    items = []
+    for x in group:
+        if x is None:
             continue
-
-        elif isinstance(group, str):
-            parts.append(group)  # single string
+        sx = str(x)
+        if sx == "" or sx.lower() == "null":
             continue
+        items.append(sx)
+    return "+".join(items)
 
-        elif (hasattr(group, '__len__') and len(group) == 0):
-            parts.append('') 
-            continue
-
-        else:
-            # Assume it's an iterable (list, tuple, R vector, etc.)
-            items = []
-            for x in group:
-                if x is None:
-                    continue
-                sx = str(x)
-                if sx == "" or sx.lower() == "null":
-                    continue
-                items.append(sx)
-
-            parts.append("+".join(items) if items else "")
-    return ".".join(parts)
+def make_key_str(key) -> str:
+    return ".".join(map(_encode_group, key))
 
 def extract_dsd_object(msg):
     """Return the first DataStructureDefinition object from a StructureMessage."""
-    for attr in ("datastructure", "metadatastructure", "structure", "_datastructure", "DataStructureDefinition"):
-        container = getattr(msg, attr, None)
-        if isinstance(container, dict) and container:
-            return next(iter(container.values()))
-    # Fallback: scan all objects
-    for obj in msg.iter_objects():
-        if obj.__class__.__name__.endswith("DataStructureDefinition"):
-            return obj
-    raise RuntimeError("No DataStructureDefinition found in StructureMessage.")
+    try:
+        return next(iter(msg.structure.values()))
+    except (AttributeError, StopIteration):
+        raise RuntimeError("No DataStructureDefinition found in StructureMessage.") from None
 
 
 def resolve_codelist(ds, component):
@@ -46,22 +31,17 @@ def resolve_codelist(ds, component):
     component: a Dimension or DataAttribute object from the DSD
     -> returns the codelist object or None
     """
-    # 1) Local representation
+    cl_map = ds.codelist
     lr = getattr(component, "local_representation", None)
-    enum_ref = getattr(lr, "enumerated", None) if lr else None
-    if enum_ref and getattr(enum_ref, "id", None) in ds.codelist:
-        return ds.codelist[enum_ref.id]
-
-    # 2) Concept's core representation
-    concept = getattr(component, "concept_identity", None)
-    cr = getattr(concept, "core_representation", None) if concept else None
-    enum_ref = getattr(cr, "enumerated", None) if cr else None
-    if enum_ref and getattr(enum_ref, "id", None) in ds.codelist:
-        return ds.codelist[enum_ref.id]
-
-    # 3) Heuristic: CL_<ID>
-    guess_id = f"CL_{component.id}"
-    if guess_id in ds.codelist:
-        return ds.codelist[guess_id]
-
-    return None
\ No newline at end of file
+    cr = getattr(getattr(component, "concept_identity", None), "core_representation", None)
+    candidates = (
+        getattr(getattr(lr, "enumerated", None), "id", None),  # 1) Local representation
+        getattr(getattr(cr, "enumerated", None), "id", None),  # 2) Concept's core representation
+        f"CL_{component.id}",                                  # 3) Heuristic: CL_<ID>
+    )
+    for cl_id in candidates:
+        if cl_id is not None:
+            codelist = cl_map.get(cl_id)
+            if codelist is not None:
+                return codelist
+    return None
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("sdmx")
+
+from imfdatapy.DataSet import convert_time_period_auto
+
+YEARS = range(1900, 2100)
+PERIODS = (
+    [str(y) for y in YEARS]
+    + [f"{y}-Q{q}" for y in YEARS for q in range(1, 5)]
+    + [f"{y}-M{m:02d}" for y in YEARS for m in range(1, 13)]
+)
+
+
+def _period_end(value: str):
+    """Reference: the original per-row Timestamp + MonthEnd conversion."""
+    if "-M" in value:
+        year, month = value.split("-M")
+        return pd.Timestamp(year=int(year), month=int(month), day=1) + pd.offsets.MonthEnd(1)
+    if "-Q" in value:
+        year, quarter = value.split("-Q")
+        return pd.Timestamp(year=int(year), month=int(quarter) * 3, day=1) + pd.offsets.MonthEnd(1)
+    return pd.Timestamp(year=int(value), month=12, day=31)
+
+
+def _convert(values, **kwargs) -> pd.Series:
+    return convert_time_period_auto(pd.DataFrame({"TIME_PERIOD": values}), **kwargs)["date"]
+
+
+def test_matches_per_row_reference():
+    result = _convert(PERIODS)
+    assert result.tolist() == [_period_end(p) for p in PERIODS]
+
+
+def test_uses_pandas_default_datetime_resolution():
+    # Must stay merge-compatible with ordinary pd.to_datetime columns
+    assert _convert(["2000", "2000-Q1"]).dtype == pd.to_datetime(["2000-01-01"]).dtype
+
+
+@pytest.mark.parametrize("freq", ["A", "Q", "M"])
+def test_declared_frequency_matches_auto_detection(freq):
+    prefix = {"A": "", "Q": "-Q", "M": "-M"}[freq]
+    values = [p for p in PERIODS if (prefix and prefix in p) or (not prefix and p.isdigit())]
+    assert _convert(values, freq=freq).tolist() == _convert(values).tolist()
+
+
+def test_zero_padded_month_and_quarter():
+    assert _convert(["1960-Q04", "1960-M004", " 1960-M4 "]).tolist() == [
+        pd.Timestamp("1960-12-31"), pd.Timestamp("1960-04-30"), pd.Timestamp("1960-04-30"),
+    ]
+
+
+def test_unrecognized_values_are_nat():
+    values = ["1960-M13", "1960-M00", "1960-Q5", "1960-Q0", "abc", "", None, "19600"]
+    assert _convert(values).isna().all()
+
+
+def test_declared_frequency_ignores_other_formats():
+    assert _convert(["1960", "1960-Q2"], freq="Q").isna().tolist() == [True, False]
+
+
+def test_categorical_input_with_repeats():
+    values = pd.Categorical(["2000-Q1", "2000-Q2", "2000-Q1", None])
+    assert _convert(values).tolist()[:3] == [
+        pd.Timestamp("2000-03-31"), pd.Timestamp("2000-06-30"), pd.Timestamp("2000-03-31"),
+    ]
+
+
+def test_years_outside_resolution_range_are_nat():
+    result = _convert(["1500", "1677", "2262", "2300-M01"])
+    if result.dtype == "datetime64[ns]":
+        assert result.isna().tolist() == [True, False, True, True]
+        assert result[1] == pd.Timestamp("1677-12-31")
+    else:
+        assert result.tolist() == [_period_end(p) for p in ["1500", "1677", "2262", "2300-M01"]]
+
+
+def test_unsupported_freq():
+    with pytest.raises(ValueError):
+        _convert(["2000"], freq="W")